@@ -11,8 +11,27 @@ IAM:
       roles/secretmanager.secretAccessor on the target secret (or project).
 """
 
-from typing import Optional
-from google.cloud import secretmanager
+from __future__ import annotations
+
+import functools
+from typing import Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from google.cloud import secretmanager
+
+
+@functools.lru_cache(maxsize=1)
+def _sm_client() -> secretmanager.SecretManagerServiceClient:
+    """
+    Return a cached Secret Manager client.
+
+    Building one runs ADC discovery and opens a gRPC channel, so repeated
+    secret fetches in the same process share a single client. The import is
+    deferred too: the gRPC stack costs hundreds of ms, paid only on first use.
+    """
+    from google.cloud import secretmanager
+
+    return secretmanager.SecretManagerServiceClient()
 
 
 def get_secret_str(
@@ -47,7 +66,7 @@ def get_secret_str(
     google.api_core.exceptions.GoogleAPICallError
         On API errors (permission denied, not found, etc.).
     """
-    c = client or secretmanager.SecretManagerServiceClient()
+    c = client or _sm_client()
     name = f"projects/{project_id}/secrets/{secret_id}/versions/{version}"
     resp = c.access_secret_version(request={"name": name})
     return resp.payload.data.decode("utf-8")
@@ -1,12 +1,33 @@
+import functools
 import requests
-import json
+from requests.adapters import HTTPAdapter
+try:
+    import orjson as _json  # 2-3x faster than stdlib json; optional
+except ImportError:
+    import json as _json
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
 import boto3
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from botocore.session import Session as BotoCoreSession
 
 IMDS_BASE = "http://169.254.169.254"
 IMDS_TIMEOUT = (0.2, 1.5)
 
+# One pooled session for all IMDS calls; keep-alive reuses a single TCP
+# socket to the metadata endpoint instead of reconnecting per request.
+_IMDS = requests.Session()
+_IMDS.mount(IMDS_BASE, HTTPAdapter(pool_connections=2, pool_maxsize=4, max_retries=0))
+
+IMDS_TOKEN_TTL = 21600  # seconds; IMDSv2 maximum
+_REFRESH_MARGIN = 300   # refresh tokens/creds this many seconds before expiry
+
+# (token, monotonic deadline) — reuse the IMDSv2 token for its TTL.
+_TOKEN_CACHE: Optional[tuple] = None
+# role name -> (credentials dict, epoch expiry) — reuse creds until near expiry.
+_CRED_CACHE: Dict[str, tuple] = {}
+
 """
 Essentially this code fetches temporary creds tied to the ec2 instance that's running the code. 
 
@@ -22,14 +43,26 @@ def get_imds_token() -> Optional[str]:
     -------
     Optional[str]
         The token string if successful, otherwise None (fall back to IMDSv1).
+
+    Notes
+    -----
+    The token is cached for its TTL (minus a refresh margin), so repeated
+    calls skip the IMDS round-trip entirely.
     """
+    global _TOKEN_CACHE
+    if _TOKEN_CACHE is not None:
+        token, deadline = _TOKEN_CACHE
+        if time.monotonic() < deadline - _REFRESH_MARGIN:
+            return token
+
     try:
-        r = requests.put(
+        r = _IMDS.put(
             f"{IMDS_BASE}/latest/api/token",
-            headers={"X-aws-ec2-metadata-token-ttl-seconds": "21600"},
+            headers={"X-aws-ec2-metadata-token-ttl-seconds": str(IMDS_TOKEN_TTL)},
             timeout=IMDS_TIMEOUT,
         )
         if r.ok:
+            _TOKEN_CACHE = (r.text, time.monotonic() + IMDS_TOKEN_TTL)
             return r.text
     except requests.RequestException:
         pass
@@ -62,7 +95,7 @@ def get_instance_metadata(path: str, token: Optional[str] = None) -> str:
         headers["X-aws-ec2-metadata-token"] = token
 
     url = f"{IMDS_BASE}/latest/meta-data/{path.lstrip('/')}"
-    r = requests.get(url, headers=headers, timeout=IMDS_TIMEOUT)
+    r = _IMDS.get(url, headers=headers, timeout=IMDS_TIMEOUT)
     r.raise_for_status()
     return r.text
 
@@ -107,9 +140,42 @@ def get_role_credentials(role_name: str, token: Optional[str] = None) -> Dict[st
         - Code
         - Type
         - LastUpdated
+
+    Notes
+    -----
+    Credentials are cached per role until shortly before their Expiration,
+    so back-to-back session constructions skip the IMDS round-trip.
     """
+    cached = _CRED_CACHE.get(role_name)
+    if cached is not None:
+        creds, expiry = cached
+        if time.time() < expiry - _REFRESH_MARGIN:
+            return creds
+
     raw = get_instance_metadata(f"iam/security-credentials/{role_name}", token)
-    return json.loads(raw)
+    creds = _json.loads(raw)
+
+    expiration = creds.get("Expiration")
+    if expiration:
+        try:
+            expiry = datetime.fromisoformat(expiration).timestamp()
+        except ValueError:
+            pass
+        else:
+            _CRED_CACHE[role_name] = (creds, expiry)
+    return creds
+
+
+@functools.lru_cache(maxsize=1)
+def _botocore_session() -> BotoCoreSession:
+    """
+    Return a cached botocore session.
+
+    botocore caches resolved credentials per session object, so reusing one
+    session keeps the provider chain (and its IMDS round-trips) from running
+    on every call; rotation is still handled by botocore's own refresher.
+    """
+    return BotoCoreSession()
 
 
 def boto3_session_from_access_key_id(
@@ -137,17 +203,47 @@ def boto3_session_from_access_key_id(
     RuntimeError
         If no role credentials with the given AccessKeyId are found.
     """
+    # Fast path: botocore's own credential resolver already handles the
+    # attached instance role, with IMDSv2 tokens, connection caching, and
+    # background refresh built in. Only fall back to walking IMDS by hand
+    # when the requested key belongs to some other attached role.
+    botocore_session = _botocore_session()
+    resolved = botocore_session.get_credentials()
+    if resolved is not None:
+        frozen = resolved.get_frozen_credentials()
+        if frozen.access_key == access_key_id:
+            return boto3.Session(botocore_session=botocore_session, region_name=region_name)
+
     token = get_imds_token()
     roles = get_role_names(token)
 
-    for role in roles:
-        creds = get_role_credentials(role, token)
-        if creds.get("AccessKeyId") == access_key_id and creds.get("Code") == "Success":
-            return boto3.Session(
-                aws_access_key_id=creds["AccessKeyId"],
-                aws_secret_access_key=creds["SecretAccessKey"],
-                aws_session_token=creds.get("Token"),
-                region_name=region_name,
-            )
+    def _matches(creds: Dict[str, Any]) -> bool:
+        return creds.get("AccessKeyId") == access_key_id and creds.get("Code") == "Success"
+
+    candidates = []
+    if len(roles) == 1:
+        # Common case: one attached role; no point spinning up threads.
+        creds = get_role_credentials(roles[0], token)
+        if _matches(creds):
+            candidates.append(creds)
+    elif roles:
+        # Each credential fetch is an independent IMDS round-trip; issue
+        # them concurrently and take the first match.
+        with ThreadPoolExecutor(max_workers=min(len(roles), 4)) as pool:
+            futures = [pool.submit(get_role_credentials, role, token) for role in roles]
+            for future in as_completed(futures):
+                creds = future.result()
+                if _matches(creds):
+                    candidates.append(creds)
+                    break
+
+    if candidates:
+        creds = candidates[0]
+        return boto3.Session(
+            aws_access_key_id=creds["AccessKeyId"],
+            aws_secret_access_key=creds["SecretAccessKey"],
+            aws_session_token=creds.get("Token"),
+            region_name=region_name,
+        )
 
     raise RuntimeError(f"No credentials found with AccessKeyId={access_key_id!r}")
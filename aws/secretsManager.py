@@ -1,3 +1,5 @@
+import base64
+
 from .imds import boto3_session_from_access_key_id
 
 def get_secret_from_secrets_manager(
@@ -26,6 +28,8 @@ def get_secret_from_secrets_manager(
     sm = session.client("secretsmanager")
     resp = sm.get_secret_value(SecretId=secret_id)
 
-    if "SecretString" in resp:
-        return resp["SecretString"]
+    # Fast path: almost all secrets are stored as SecretString.
+    secret = resp.get("SecretString")
+    if secret is not None:
+        return secret
     return base64.b64decode(resp["SecretBinary"]).decode("utf-8")
\ No newline at end of file